@@ -2,30 +2,123 @@
 # -*- coding: utf-8 -*-
 """批量文件名修改工具 - 错误处理模块"""
 
+import atexit
 import logging
-import traceback
+import logging.handlers
+import queue
 from PyQt5.QtWidgets import QMessageBox, QApplication
 from PyQt5.QtCore import QObject
 
 
+class _BufferedFileHandler(logging.FileHandler):
+    """带写缓冲的文件日志处理器，多条记录合并写入文件，由 _FlushingQueueListener 按批刷新"""
+    
+    buffer_size = 65536
+    
+    def _open(self):
+        """以较大的缓冲区打开日志文件"""
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding)
+    
+    def emit(self, record):
+        """写入一条日志记录，不在每条记录后立即刷新"""
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """日志队列处理器，记录原样放入队列，消息和异常堆栈由监听线程在写入时格式化"""
+    
+    def prepare(self, record):
+        """
+        不在调用线程中格式化记录
+        
+        默认实现会在放入队列前格式化消息和异常堆栈，以便记录跨进程传递；
+        这里的队列只在本进程内使用，直接传递原始记录即可
+        """
+        return record
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """日志队列监听器，每次取空队列后刷新处理器，连续的多条记录只写盘一次，且不会滞留到程序退出"""
+    
+    def handle(self, record):
+        """处理一条日志记录，队列中没有后续记录时刷新各处理器的缓冲"""
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+# 进程内唯一的日志监听器，第一次创建 ErrorHandler 时启动
+_listener = None
+
+
+def _get_logger():
+    """
+    初始化错误日志，整个进程只执行一次，之后创建的 ErrorHandler 共用同一套处理器
+    
+    Returns:
+        程序使用的日志记录器
+    """
+    global _listener
+    logger = logging.getLogger('FileRenameTool')
+    if _listener is not None:
+        return logger
+    
+    # 部分文件操作失败的汇总以警告级别记录，非交互模式下同样能在日志中查到
+    logger.setLevel(logging.WARNING)
+    
+    # 日志写入文件在后台线程中完成，调用方只需将记录放入队列
+    log_queue = queue.Queue(-1)
+    file_handler = _BufferedFileHandler('file_rename_errors.log', mode='a', delay=True)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(_DeferredQueueHandler(log_queue))
+    
+    _listener = _FlushingQueueListener(log_queue, file_handler)
+    _listener.start()
+    
+    # 程序退出时先停止监听线程取出队列中的日志，再刷新文件缓冲（atexit 按注册的逆序执行）
+    atexit.register(file_handler.flush)
+    atexit.register(_listener.stop)
+    return logger
+
+
 class ErrorHandler(QObject):
     """错误处理器类，用于统一处理和显示各种错误信息"""
     
     def __init__(self):
         super().__init__()
+        self._interactive = True
+        self._parent = None
         self._setup_logging()
     
+    def set_parent(self, widget):
+        """
+        设置对话框的父窗口，避免每次弹窗都查询当前活动窗口
+        
+        Args:
+            widget: 作为对话框父窗口的控件，通常为主窗口
+        """
+        self._parent = widget
+    
+    def set_interactive(self, interactive: bool):
+        """
+        设置是否以交互模式运行
+        
+        Args:
+            interactive: False 表示非交互（批处理/无界面）模式，只记录日志而不弹出对话框
+        """
+        self._interactive = interactive
+    
     def _setup_logging(self):
         """设置日志记录配置"""
-        # 配置基本的日志记录
-        logging.basicConfig(
-            level=logging.ERROR,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            filename='file_rename_errors.log',
-            filemode='a'
-        )
-        
-        self.logger = logging.getLogger('FileRenameTool')
+        self.logger = _get_logger()
     
     def show_error(self, title: str, message: str):
         """
@@ -38,9 +131,12 @@ class ErrorHandler(QObject):
         # 记录到日志
         self.logger.error(f"{title}: {message}")
         
+        if not self._interactive:
+            return
+        
         # 显示错误对话框
         QMessageBox.critical(
-            QApplication.activeWindow(),
+            self._parent or QApplication.activeWindow(),
             title,
             message,
             QMessageBox.Ok
@@ -57,9 +153,12 @@ class ErrorHandler(QObject):
         # 记录到日志
         self.logger.warning(f"{title}: {message}")
         
+        if not self._interactive:
+            return
+        
         # 显示警告对话框
         QMessageBox.warning(
-            QApplication.activeWindow(),
+            self._parent or QApplication.activeWindow(),
             title,
             message,
             QMessageBox.Ok
@@ -73,27 +172,34 @@ class ErrorHandler(QObject):
             title: 信息对话框标题
             message: 信息消息内容
         """
+        if not self._interactive:
+            return
+        
         # 显示信息对话框
         QMessageBox.information(
-            QApplication.activeWindow(),
+            self._parent or QApplication.activeWindow(),
             title,
             message,
             QMessageBox.Ok
         )
     
-    def ask_question(self, title: str, message: str) -> bool:
+    def ask_question(self, title: str, message: str, default: bool = False) -> bool:
         """
         显示确认对话框，返回用户的选择
         
         Args:
             title: 对话框标题
             message: 消息内容
+            default: 非交互模式下不弹出对话框，直接返回该值
             
         Returns:
             True表示用户确认，False表示用户取消
         """
+        if not self._interactive:
+            return default
+        
         reply = QMessageBox.question(
-            QApplication.activeWindow(),
+            self._parent or QApplication.activeWindow(),
             title,
             message,
             QMessageBox.Yes | QMessageBox.No,
@@ -113,17 +219,18 @@ class ErrorHandler(QObject):
         # 获取详细的异常信息
         error_type = type(exception).__name__
         error_message = str(exception)
-        stack_trace = traceback.format_exc()
         
-        # 记录到日志
-        log_message = f"{context}\n{error_type}: {error_message}\n{stack_trace}"
-        self.logger.error(log_message)
+        # 记录到日志，异常堆栈由监听线程在写入文件时才进行格式化，不占用调用线程
+        self.logger.error("%s", context, exc_info=exception)
         
         # 显示简化的错误信息给用户
         display_message = f"{context}\n\n错误类型: {error_type}\n错误信息: {error_message}\n\n详细信息已记录到日志文件。"
         
+        if not self._interactive:
+            return
+        
         QMessageBox.critical(
-            QApplication.activeWindow(),
+            self._parent or QApplication.activeWindow(),
             "程序错误",
             display_message,
             QMessageBox.Ok
@@ -4,51 +4,204 @@
 
 import os
 import re
+import functools
+import concurrent.futures
 import datetime
 import shutil
-from typing import List, Tuple, Optional
+import stat
+import sys
+from typing import Callable, Iterator, List, Tuple, Optional
+
+
+# 当前平台是否支持以目录文件描述符调用 os.scandir（Windows 不支持）
+_SCANDIR_SUPPORTS_FD = os.scandir in os.supports_fd
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+# 当前平台的 os.rename 是否支持相对目录文件描述符（renameat）
+_RENAME_SUPPORTS_DIR_FD = os.rename in os.supports_dir_fd
+
+# 计算文件名长度所用的编码及编码后的最大字节数：
+# NTFS 限制为 255 个 UTF-16 编码单元，POSIX 文件系统限制为 255 字节（按文件系统编码）
+if sys.platform == 'win32':
+    _NAME_ENCODING = 'utf-16-le'
+    _MAX_FILENAME_BYTES = 255 * 2
+else:
+    _NAME_ENCODING = sys.getfilesystemencoding()
+    _MAX_FILENAME_BYTES = 255
+
+# Windows系统中不允许出现在文件名里的字符，统一替换为下划线
+_INVALID_CHARS_TABLE = str.maketrans({c: '_' for c in '"*:<>?|/\\'})
+
+# Windows保留文件名
+_RESERVED_NAMES = frozenset([
+    'CON', 'PRN', 'AUX', 'NUL',
+    'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+    'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9',
+])
+
+
+def _fast_exists_and_type(path: str) -> Tuple[bool, bool, int]:
+    """
+    用一次 stat 同时获取路径是否存在、是否为文件及其模式位
+    
+    Args:
+        path: 要检查的路径
+        
+    Returns:
+        (是否存在, 是否为普通文件, st_mode) 元组，路径不存在时模式位为0
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return False, False, 0
+    return True, stat.S_ISREG(mode), mode
+
+
+def _path_key(path: str) -> str:
+    """返回用于比较的规范化绝对路径，Windows 下忽略大小写"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _is_same_directory(src_dir: str, target_abs_dir: str) -> bool:
+    """
+    判断源目录与目标文件夹是否为同一目录，绝对路径相同时无需 samefile 的两次 stat
+    
+    Args:
+        src_dir: 源文件所在目录
+        target_abs_dir: 目标文件夹的绝对路径
+        
+    Returns:
+        是否为同一目录
+    """
+    normcase = os.path.normcase
+    if normcase(os.path.abspath(src_dir)) == normcase(target_abs_dir):
+        return True
+    try:
+        # 路径字符串不同（如符号链接）时再比较实际文件
+        return os.path.samefile(src_dir, target_abs_dir)
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_filename_impl(filename: str) -> str:
+    """
+    FileOperations._validate_filename 的实现，结果只取决于输入，因此缓存重复出现的文件名
+    
+    Args:
+        filename: 文件名
+        
+    Returns:
+        处理后的合法文件名
+    """
+    # 检查文件名长度：文件系统限制的是编码后的长度而非字符数
+    encoded = filename.encode(_NAME_ENCODING, errors='replace')
+    if len(encoded) > _MAX_FILENAME_BYTES:
+        # 截断文件名，但保留扩展名；按字节截断后丢弃被截断的半个字符（UTF-16 下为半个代理对）
+        name, ext = os.path.splitext(filename)
+        max_name_bytes = max(0, _MAX_FILENAME_BYTES - len(ext.encode(_NAME_ENCODING, errors='replace')))
+        name = name.encode(_NAME_ENCODING, errors='replace')[:max_name_bytes].decode(_NAME_ENCODING, errors='ignore')
+        filename = f"{name}{ext}"
+    
+    # 检查并替换Windows系统中不允许的字符
+    filename = filename.translate(_INVALID_CHARS_TABLE)
+    
+    # 检查文件名是否为空
+    if not filename or filename.isspace():
+        filename = "unnamed"
+    
+    # 检查文件名是否仅包含点或空格
+    while filename.startswith('.'):
+        filename = filename[1:] or "unnamed"
+    
+    # 检查保留文件名
+    name_without_ext = os.path.splitext(filename)[0].upper()
+    if name_without_ext in _RESERVED_NAMES:
+        filename = f"{filename}_renamed"
+    
+    return filename
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_replace_pattern(find_str: str, case_sensitive: bool) -> "re.Pattern":
+    """编译并缓存用于字符串替换的正则对象，批量处理时只需编译一次"""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(re.escape(find_str), flags)
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_regex(pattern: str) -> "re.Pattern":
+    """编译并缓存用户输入的正则表达式，无效时抛出 re.error"""
+    return re.compile(pattern)
 
 
 class FileOperations:
     """文件操作核心类，提供各种文件重命名功能"""
     
-    def get_files_in_directory(self, directory_path: str) -> List[Tuple[str, int, datetime.datetime]]:
+    def iter_file_stats(self, directory_path: str) -> Iterator[Tuple[str, int, float]]:
         """
-        获取目录中的所有文件信息
+        逐个生成目录中的文件信息，修改时间保留为 st_mtime 时间戳，不构造 datetime 对象
         
         Args:
             directory_path: 目录路径
             
-        Returns:
-            包含文件信息的列表，每项为 (文件路径, 文件大小, 修改时间) 元组
+        Yields:
+            (文件路径, 文件大小, 修改时间戳) 元组，顺序与目录遍历顺序一致
         """
-        file_list = []
-        
         try:
-            for filename in os.listdir(directory_path):
-                file_path = os.path.join(directory_path, filename)
-                
-                # 只处理文件，跳过目录
-                if os.path.isfile(file_path):
-                    # 获取文件大小（字节）
-                    file_size = os.path.getsize(file_path)
-                    
-                    # 获取文件修改时间
-                    modified_time = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-                    
-                    file_list.append((file_path, file_size, modified_time))
+            # 使用 os.scandir 复用目录项中缓存的信息，避免每个文件多次 stat
+            join = os.path.join
             
-            # 按文件名排序
-            file_list.sort(key=lambda x: x[0])
+            # 支持时通过目录文件描述符遍历，stat 相对该目录进行，无需每次从根解析路径
+            dir_fd = os.open(directory_path, _DIR_OPEN_FLAGS) if _SCANDIR_SUPPORTS_FD else None
+            try:
+                with os.scandir(directory_path if dir_fd is None else dir_fd) as it:
+                    for entry in it:
+                        # 只处理文件，跳过目录
+                        if entry.is_file():
+                            st = entry.stat()
+                            yield join(directory_path, entry.name), st.st_size, st.st_mtime
+            finally:
+                if dir_fd is not None:
+                    os.close(dir_fd)
             
         except PermissionError as e:
             raise PermissionError(f"没有权限访问目录 '{directory_path}': {str(e)}")
         except Exception as e:
             raise Exception(f"读取目录内容时出错: {str(e)}")
+    
+    def get_files_in_directory(self, directory_path: str,
+                               sort_by: Optional[str] = 'name') -> List[Tuple[str, int, datetime.datetime]]:
+        """
+        获取目录中的所有文件信息
+        
+        Args:
+            directory_path: 目录路径
+            sort_by: 排序方式，'name' 按文件名、'size' 按文件大小，None 表示不排序
+            
+        Returns:
+            包含文件信息的列表，每项为 (文件路径, 文件大小, 修改时间) 元组
+        """
+        if sort_by not in ('name', 'size', None):
+            raise ValueError(f"不支持的排序方式: {sort_by}")
+        
+        fromtimestamp = datetime.datetime.fromtimestamp
+        file_list = [
+            (file_path, file_size, fromtimestamp(mtime))
+            for file_path, file_size, mtime in self.iter_file_stats(directory_path)
+        ]
+        
+        if sort_by == 'name':
+            # 按文件名排序（同一目录下与按路径排序结果一致），只比较路径而不比较整个元组
+            file_list.sort(key=lambda x: x[0])
+        elif sort_by == 'size':
+            # 按文件大小排序
+            file_list.sort(key=lambda x: x[1])
         
         return file_list
     
-    def add_prefix_suffix(self, file_path: str, prefix: str = "", suffix: str = "") -> str:
+    def add_prefix_suffix(self, file_path: str, prefix: str = "", suffix: str = "",
+                          name_parts: Optional[Tuple[str, str]] = None) -> str:
         """
         为文件名添加前缀和后缀
         
@@ -56,12 +209,14 @@ class FileOperations:
             file_path: 文件路径
             prefix: 要添加的前缀
             suffix: 要添加的后缀（添加在扩展名之前）
+            name_parts: 预先拆分好的 (主文件名, 扩展名)，为None时从路径中拆分
             
         Returns:
             新的文件名（不包含路径）
         """
-        directory, filename = os.path.split(file_path)
-        name, ext = os.path.splitext(filename)
+        if name_parts is None:
+            name_parts = os.path.splitext(os.path.basename(file_path))
+        name, ext = name_parts
         
         # 添加前缀和后缀
         new_name = f"{prefix}{name}{suffix}{ext}"
@@ -69,7 +224,8 @@ class FileOperations:
         # 验证文件名合法性
         return self._validate_filename(new_name)
     
-    def replace_string(self, file_path: str, find_str: str, replace_str: str, case_sensitive: bool = True) -> str:
+    def replace_string(self, file_path: str, find_str: str, replace_str: str, case_sensitive: bool = True,
+                       folded_find_str: Optional[str] = None) -> str:
         """
         替换文件名中的字符串
         
@@ -78,19 +234,30 @@ class FileOperations:
             find_str: 要查找的字符串
             replace_str: 要替换的字符串
             case_sensitive: 是否区分大小写
+            folded_find_str: 预先计算的 find_str.casefold()，批量调用时由调用方只计算一次
             
         Returns:
             新的文件名（不包含路径）
         """
-        directory, filename = os.path.split(file_path)
+        filename = os.path.basename(file_path)
         
-        # 根据是否区分大小写执行替换
+        # 根据是否区分大小写执行替换，文件名中不包含要查找的内容时直接跳过替换
         if case_sensitive:
-            new_filename = filename.replace(find_str, replace_str)
+            if find_str in filename:
+                new_filename = filename.replace(find_str, replace_str)
+            else:
+                new_filename = filename
         else:
-            # 不区分大小写替换
-            pattern = re.compile(re.escape(find_str), re.IGNORECASE)
-            new_filename = pattern.sub(replace_str, filename)
+            if folded_find_str is None:
+                folded_find_str = find_str.casefold()
+            # 只有查找内容和文件名都是 ASCII 时，大小写折叠后的子串判断才与 IGNORECASE 的匹配结果一致；
+            # 含其他字符时两者可能不同（如 "I" 可匹配 "ı"），此时直接交给正则处理
+            if find_str.isascii() and filename.isascii() and folded_find_str not in filename.casefold():
+                new_filename = filename
+            else:
+                # 不区分大小写替换
+                pattern = _compile_replace_pattern(find_str, False)
+                new_filename = pattern.sub(replace_str, filename)
         
         # 验证文件名合法性
         return self._validate_filename(new_filename)
@@ -110,8 +277,8 @@ class FileOperations:
         directory, filename = os.path.split(file_path)
         
         try:
-            # 编译正则表达式
-            regex = re.compile(pattern)
+            # 编译正则表达式（已缓存）
+            regex = _compile_regex(pattern)
             
             # 执行替换
             new_filename = regex.sub(replace_str, filename)
@@ -122,6 +289,28 @@ class FileOperations:
         except re.error as e:
             raise ValueError(f"无效的正则表达式: {str(e)}")
     
+    def batch_regex_replace(self, file_paths: List[str], pattern: str, replace_str: str) -> List[str]:
+        """
+        使用同一个正则表达式批量替换多个文件名，正则只编译一次
+        
+        Args:
+            file_paths: 文件路径列表
+            pattern: 正则表达式模式
+            replace_str: 替换字符串
+            
+        Returns:
+            新的文件名列表（不包含路径），与 file_paths 一一对应
+        """
+        basename = os.path.basename
+        validate = self._validate_filename
+        
+        try:
+            # 编译正则表达式（已缓存）；替换字符串中的无效分组引用在 sub 时才会报错
+            sub = _compile_regex(pattern).sub
+            return [validate(sub(replace_str, basename(file_path))) for file_path in file_paths]
+        except re.error as e:
+            raise ValueError(f"无效的正则表达式: {str(e)}")
+    
     def numbering_rename(self, file_path: str, prefix: str = "", suffix: str = "", 
                          start_num: int = 1, digits: int = 3) -> str:
         """
@@ -137,8 +326,7 @@ class FileOperations:
         Returns:
             新的文件名（不包含路径）
         """
-        directory, filename = os.path.split(file_path)
-        _, ext = os.path.splitext(filename)
+        ext = os.path.splitext(file_path)[1]
         
         # 格式化序号
         num_format = f"{{:0{digits}d}}"
@@ -150,6 +338,36 @@ class FileOperations:
         # 验证文件名合法性
         return self._validate_filename(new_filename)
     
+    def batch_numbering_rename(self, file_paths: List[str], prefix: str = "", suffix: str = "",
+                               start_num: int = 1, digits: int = 3,
+                               extensions: Optional[List[str]] = None) -> List[str]:
+        """
+        使用连续序号批量重命名文件，格式字符串只构建一次
+        
+        Args:
+            file_paths: 文件路径列表，按顺序依次分配序号
+            prefix: 序号前的前缀
+            suffix: 序号后的后缀
+            start_num: 起始序号
+            digits: 序号数字位数
+            extensions: 预先拆分好的扩展名列表，与 file_paths 一一对应，为None时从路径中拆分
+            
+        Returns:
+            新的文件名列表（不包含路径），与 file_paths 一一对应
+        """
+        if extensions is None:
+            splitext = os.path.splitext
+            extensions = [splitext(file_path)[1] for file_path in file_paths]
+        
+        # 序号宽度在循环外确定，循环内由单个 f-string 完成拼接和补零
+        width = f"0{digits}d"
+        validate = self._validate_filename
+        
+        return [
+            validate(f"{prefix}{num:{width}}{suffix}{ext}")
+            for num, ext in enumerate(extensions, start_num)
+        ]
+    
     def rename_file(self, file_path: str, new_name: str, target_dir: Optional[str] = None) -> bool:
         """
         执行文件重命名操作，可以指定目标文件夹
@@ -162,16 +380,40 @@ class FileOperations:
         Returns:
             重命名是否成功
         """
+        src_dir = os.path.dirname(file_path)
         if target_dir is None:
-            directory = os.path.dirname(file_path)
-        else:
-            # 确保目标目录存在
-            if not os.path.exists(target_dir):
-                raise FileNotFoundError(f"目标文件夹 '{target_dir}' 不存在")
-            if not os.path.isdir(target_dir):
-                raise NotADirectoryError(f"'{target_dir}' 不是有效的目录")
-            directory = target_dir
+            return self._rename_file_fast(file_path, new_name, src_dir, None, True)
+        
+        # 确保目标目录存在
+        exists, _, mode = _fast_exists_and_type(target_dir)
+        if not exists:
+            raise FileNotFoundError(f"目标文件夹 '{target_dir}' 不存在")
+        if not stat.S_ISDIR(mode):
+            raise NotADirectoryError(f"'{target_dir}' 不是有效的目录")
+        
+        target_abs_dir = os.path.abspath(target_dir)
+        same_dir = _is_same_directory(src_dir, target_abs_dir)
+        
+        return self._rename_file_fast(file_path, new_name, src_dir, target_abs_dir, same_dir)
+    
+    def _rename_file_fast(self, file_path: str, new_name: str, src_dir: str,
+                          target_abs_dir: Optional[str], same_dir: bool,
+                          dir_fd: Optional[int] = None) -> bool:
+        """
+        执行单个文件的重命名，目录相关的检查结果由调用方预先计算并传入
+        
+        Args:
+            file_path: 原始文件路径
+            new_name: 新的文件名（不包含路径）
+            src_dir: 原始文件所在目录，即 os.path.dirname(file_path)
+            target_abs_dir: 目标文件夹的绝对路径（已验证存在），为None则在原目录重命名
+            same_dir: 目标文件夹是否与原始文件所在目录相同
+            dir_fd: 已打开的原始文件所在目录的文件描述符，同目录重命名时直接相对该目录进行
             
+        Returns:
+            重命名是否成功
+        """
+        directory = src_dir if target_abs_dir is None else target_abs_dir
         new_path = os.path.join(directory, new_name)
         
         # 检查新文件路径是否与原路径相同
@@ -179,16 +421,20 @@ class FileOperations:
             return True  # 文件名未变化，视为成功
         
         # 检查目标文件是否已存在
-        if os.path.exists(new_path):
+        if _fast_exists_and_type(new_path)[0]:
             raise FileExistsError(f"文件 '{new_name}' 已存在于目标文件夹")
         
         try:
             # 执行重命名或移动
-            if target_dir is None or os.path.samefile(os.path.dirname(file_path), target_dir):
+            if same_dir and dir_fd is not None:
+                # 同一目录下的重命名，相对已打开的目录进行，内核无需重新解析完整路径
+                os.rename(os.path.basename(file_path), new_name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            elif same_dir:
                 # 同一目录下的重命名
                 os.rename(file_path, new_path)
             else:
-                # 不同目录间的复制和重命名
+                # 不同目录间的复制和重命名：按设计保留原始文件，
+                # 因此即使位于同一文件系统也不能改用 os.replace 移动
                 shutil.copy2(file_path, new_path)  # 复制文件保留元数据
             return True
         except PermissionError:
@@ -206,36 +452,7 @@ class FileOperations:
         Returns:
             处理后的合法文件名
         """
-        # 检查文件名长度
-        if len(filename) > 255:
-            # 截断文件名，但保留扩展名
-            name, ext = os.path.splitext(filename)
-            max_name_length = 255 - len(ext)
-            filename = f"{name[:max_name_length]}{ext}"
-        
-        # 检查并替换Windows系统中不允许的字符
-        invalid_chars = '"*:<>?|/\\'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        # 检查文件名是否为空
-        if not filename or filename.isspace():
-            filename = "unnamed"
-        
-        # 检查文件名是否仅包含点或空格
-        while filename.startswith('.'):
-            filename = filename[1:] or "unnamed"
-        
-        # 检查保留文件名
-        reserved_names = ['CON', 'PRN', 'AUX', 'NUL', 
-                         'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-                         'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9']
-        
-        name_without_ext = os.path.splitext(filename)[0].upper()
-        if name_without_ext in reserved_names:
-            filename = f"{filename}_renamed"
-        
-        return filename
+        return _validate_filename_impl(filename)
     
     def check_file_permissions(self, file_path: str) -> bool:
         """
@@ -249,13 +466,16 @@ class FileOperations:
         """
         return os.access(file_path, os.R_OK) and os.access(file_path, os.W_OK)
     
-    def batch_rename(self, file_mappings: List[Tuple[str, str]], target_dir: Optional[str] = None) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    def batch_rename(self, file_mappings: List[Tuple[str, str]], target_dir: Optional[str] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
         """
         批量重命名文件，可以指定目标文件夹
         
         Args:
             file_mappings: 文件映射列表，每项为 (原路径, 新名称) 元组
             target_dir: 目标文件夹路径，如果为None则在原目录重命名
+            progress_callback: 进度回调，每处理完一个文件以 (已完成数, 待执行总数) 调用一次，
+                               在调用 batch_rename 的线程中执行
             
         Returns:
             (成功列表, 失败列表)，每个列表包含 (原路径, 新路径) 或 (原路径, 错误信息) 元组
@@ -265,47 +485,129 @@ class FileOperations:
         
         # 验证目标文件夹
         if target_dir is not None:
-            if not os.path.exists(target_dir):
+            exists, _, mode = _fast_exists_and_type(target_dir)
+            if not exists:
                 raise FileNotFoundError(f"目标文件夹 '{target_dir}' 不存在")
-            if not os.path.isdir(target_dir):
+            if not stat.S_ISDIR(mode):
                 raise NotADirectoryError(f"'{target_dir}' 不是有效的目录")
+            target_abs_dir = os.path.abspath(target_dir)
+        else:
+            target_abs_dir = None
         
-        # 第一遍检查：检查所有目标文件是否存在
-        target_files = set()
+        # 各源目录是否与目标文件夹相同，按目录缓存，避免每个文件都调用 samefile
+        same_dir_cache = {}
+        
+        # 计算每个文件的目标路径，以及是否在原目录内移动（否则为复制到目标文件夹）
+        planned = []
         for file_path, new_name in file_mappings:
-            if target_dir is None:
-                directory = os.path.dirname(file_path)
+            src_dir = os.path.dirname(file_path)
+            if target_abs_dir is None:
+                directory = src_dir
+                same_dir = True
             else:
                 directory = target_dir
-                
-            new_path = os.path.join(directory, new_name)
-            
-            if new_path in target_files:
+                same_dir = same_dir_cache.get(src_dir)
+                if same_dir is None:
+                    same_dir = _is_same_directory(src_dir, target_abs_dir)
+                    same_dir_cache[src_dir] = same_dir
+            planned.append((file_path, new_name, os.path.join(directory, new_name), src_dir, same_dir))
+        
+        # 本批中会被移走的源文件；目标文件已存在但正是其中之一时（如 002→001、003→002），
+        # 只要先执行移走它的那一项即可腾出位置，不算冲突
+        moved_sources = {_path_key(item[0]): i for i, item in enumerate(planned) if item[4]}
+        
+        # 第一遍检查：检查所有目标文件是否存在
+        target_files = set()
+        failed_paths = set()
+        for i, (file_path, new_name, new_path, src_dir, same_dir) in enumerate(planned):
+            new_key = _path_key(new_path)
+            if new_key in target_files:
                 failures.append((file_path, "目标文件名冲突"))
+                failed_paths.add(file_path)
                 continue
             
-            if os.path.exists(new_path) and os.path.abspath(file_path) != os.path.abspath(new_path):
+            if (_fast_exists_and_type(new_path)[0] and os.path.abspath(file_path) != os.path.abspath(new_path)
+                    and moved_sources.get(new_key, i) == i):
                 failures.append((file_path, "目标文件已存在"))
+                failed_paths.add(file_path)
                 continue
             
-            target_files.add(new_path)
-        
-        # 第二遍执行：实际执行重命名或移动
-        for file_path, new_name in file_mappings:
-            # 跳过已标记为失败的文件
-            if any(f[0] == file_path for f in failures):
+            target_files.add(new_key)
+        
+        # 跳过已标记为失败的文件
+        tasks = [item for item in planned if item[0] not in failed_paths]
+        if not tasks:
+            return successes, failures
+        
+        # 目标路径是另一项的源路径时，该项必须先执行。目标路径互不相同，因此每项最多依赖一项、
+        # 也最多被一项依赖，所有依赖关系构成若干条互不相交的链
+        source_index = {_path_key(task[0]): i for i, task in enumerate(tasks) if task[4]}
+        blocked = set()
+        dependent = {}
+        for i, task in enumerate(tasks):
+            j = source_index.get(_path_key(task[2]))
+            if j is not None and j != i:
+                blocked.add(i)
+                dependent[j] = i
+        
+        # 从不依赖其他项的任务出发，沿依赖关系得到每条链的执行顺序
+        chains = []
+        for i in range(len(tasks)):
+            if i in blocked:
                 continue
+            chain = [i]
+            while chain[-1] in dependent:
+                chain.append(dependent[chain[-1]])
+            chains.append(chain)
+        
+        # 没有出现在任何链中的任务互相依赖成环（如两个文件互换名称），无法直接重命名
+        outcomes = [FileExistsError("目标文件已存在")] * len(tasks)
+        
+        # 同目录重命名时每个源目录只打开一次，之后的重命名都相对该目录进行
+        dir_fds = {}
+        try:
+            if _RENAME_SUPPORTS_DIR_FD:
+                for _, _, _, src_dir, same_dir in tasks:
+                    if same_dir and src_dir not in dir_fds:
+                        try:
+                            dir_fds[src_dir] = os.open(src_dir or os.curdir, _DIR_OPEN_FLAGS)
+                        except OSError:
+                            # 无法打开目录时退回到按完整路径重命名
+                            dir_fds[src_dir] = None
             
-            try:
-                success = self.rename_file(file_path, new_name, target_dir)
-                if success:
-                    if target_dir is None:
-                        directory = os.path.dirname(file_path)
-                    else:
-                        directory = target_dir
-                    new_path = os.path.join(directory, new_name)
+            def run_chain(chain):
+                # 链内按依赖顺序串行执行，前一项失败时后一项会因目标文件仍存在而失败
+                for i in chain:
+                    file_path, new_name, _, src_dir, same_dir = tasks[i]
+                    try:
+                        outcomes[i] = self._rename_file_fast(file_path, new_name, src_dir, target_abs_dir, same_dir,
+                                                             dir_fds.get(src_dir) if same_dir else None)
+                    except Exception as e:
+                        outcomes[i] = e
+            
+            # 第二遍执行：重命名是I/O操作且会释放GIL，使用线程池并发执行；
+            # 每条链作为一个整体提交，互相依赖的重命名不会同时执行
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(chains) or 1)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [(len(chain), executor.submit(run_chain, chain)) for chain in chains]
+                
+                total = len(tasks)
+                done = 0
+                for chain_length, future in futures:
+                    future.result()
+                    done += chain_length
+                    if progress_callback is not None:
+                        progress_callback(done, total)
+            
+            # 按输入顺序整理结果
+            for (file_path, _, new_path, _, _), outcome in zip(tasks, outcomes):
+                if isinstance(outcome, Exception):
+                    failures.append((file_path, str(outcome)))
+                elif outcome:
                     successes.append((file_path, new_path))
-            except Exception as e:
-                failures.append((file_path, str(e)))
+        finally:
+            for dir_fd in dir_fds.values():
+                if dir_fd is not None:
+                    os.close(dir_fd)
         
         return successes, failures
\ No newline at end of file
@@ -25,6 +25,11 @@ def main():
     
     # 创建并显示主窗口
     main_window = MainWindow()
+    
+    # 非交互模式（命令行参数 --non-interactive 或环境变量 FILE_RENAME_NONINTERACTIVE=1）
+    # 下错误只写入日志，不弹出对话框
+    if '--non-interactive' in sys.argv or os.environ.get('FILE_RENAME_NONINTERACTIVE') == '1':
+        main_window.error_handler.set_interactive(False)
     main_window.show()
     
     # 运行应用程序
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""文件操作核心模块测试"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_operations import FileOperations
+
+
+class BatchRenameTest(unittest.TestCase):
+    """batch_rename 的测试"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+        self.file_ops = FileOperations()
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def _create(self, *names):
+        for name in names:
+            with open(os.path.join(self.directory, name), 'w') as f:
+                f.write(name)
+    
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+    
+    def _contents(self):
+        result = {}
+        for name in os.listdir(self.directory):
+            with open(self._path(name)) as f:
+                result[name] = f.read()
+        return result
+    
+    def test_shifted_numbering(self):
+        """删除 001 后重新编号：002→001、003→002、004→003"""
+        self._create("002.txt", "003.txt", "004.txt")
+        mappings = [(self._path("002.txt"), "001.txt"),
+                    (self._path("003.txt"), "002.txt"),
+                    (self._path("004.txt"), "003.txt")]
+        
+        successes, failures = self.file_ops.batch_rename(mappings)
+        
+        self.assertEqual(failures, [])
+        self.assertEqual(successes, [(self._path("002.txt"), self._path("001.txt")),
+                                     (self._path("003.txt"), self._path("002.txt")),
+                                     (self._path("004.txt"), self._path("003.txt"))])
+        self.assertEqual(self._contents(), {"001.txt": "002.txt", "002.txt": "003.txt", "003.txt": "004.txt"})
+    
+    def test_shifted_numbering_upwards(self):
+        """依赖顺序与输入顺序相反时同样按链执行：001→002、002→003"""
+        self._create("001.txt", "002.txt")
+        mappings = [(self._path("001.txt"), "002.txt"),
+                    (self._path("002.txt"), "003.txt")]
+        
+        successes, failures = self.file_ops.batch_rename(mappings)
+        
+        self.assertEqual(failures, [])
+        self.assertEqual(len(successes), 2)
+        self.assertEqual(self._contents(), {"002.txt": "001.txt", "003.txt": "002.txt"})
+    
+    def test_swap_fails_without_changes(self):
+        """互换名称的任务构成环，无法直接完成，文件保持不变"""
+        self._create("a.txt", "b.txt")
+        mappings = [(self._path("a.txt"), "b.txt"),
+                    (self._path("b.txt"), "a.txt")]
+        
+        successes, failures = self.file_ops.batch_rename(mappings)
+        
+        self.assertEqual(successes, [])
+        self.assertEqual(len(failures), 2)
+        self.assertEqual(self._contents(), {"a.txt": "a.txt", "b.txt": "b.txt"})
+    
+    def test_existing_target_outside_batch(self):
+        """目标文件已存在且不会被本批移走时报告冲突"""
+        self._create("a.txt", "b.txt")
+        
+        successes, failures = self.file_ops.batch_rename([(self._path("a.txt"), "b.txt")])
+        
+        self.assertEqual(successes, [])
+        self.assertEqual(failures, [(self._path("a.txt"), "目标文件已存在")])
+
+
+if __name__ == '__main__':
+    unittest.main()
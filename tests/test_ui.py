@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""图形用户界面模块测试"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 无显示环境下使用 offscreen 平台创建窗口
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+try:
+    from PyQt5.QtWidgets import QApplication
+    import ui
+except ImportError:
+    ui = None
+
+
+@unittest.skipIf(ui is None, "需要安装 PyQt5")
+class FileTableModelTest(unittest.TestCase):
+    """FileTableModel 的测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+    
+    def test_out_of_range_mtime(self):
+        """修改时间无法格式化时显示为空，不向 Qt 抛出异常"""
+        window = ui.MainWindow()
+        window.filtered_files = [ui._make_file_info('/d/a.txt', 1, 1e15),
+                                 ui._make_file_info('/d/b.txt', 1, 0.0)]
+        window.update_original_files_tree()
+        model = window.original_files_model
+        
+        self.assertEqual(model.data(model.index(0, 0)), "a.txt")
+        self.assertEqual(model.data(model.index(0, 2)), "")
+        self.assertEqual(model.data(model.index(1, 2)), window.format_time(0.0))
+    
+    def test_formatter_error(self):
+        """列格式化函数出错时返回 None"""
+        model = ui.FileTableModel(["文件名"], [lambda row: row[1]])
+        model.set_rows([("a.txt",)])
+        
+        self.assertIsNone(model.data(model.index(0, 0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
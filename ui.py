@@ -3,19 +3,61 @@
 """批量文件名修改工具 - 图形用户界面模块"""
 
 import os
+import datetime
+import operator
+from collections import Counter
+from typing import NamedTuple
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLabel, 
-    QLineEdit, QComboBox, QTreeWidget, QTreeWidgetItem, QFileDialog, QGroupBox,
-    QFormLayout, QSpinBox, QDateTimeEdit, QCheckBox, QTabWidget, QMessageBox,
+    QLineEdit, QComboBox, QTreeView, QFileDialog, QGroupBox,
+    QFormLayout, QSpinBox, QDateTimeEdit, QCheckBox, QTabWidget,
     QSplitter, QProgressBar, QRadioButton, QButtonGroup
 )
-from PyQt5.QtCore import Qt, QDateTime, pyqtSignal, QThread
+from PyQt5.QtCore import Qt, QDateTime, pyqtSignal, QThread, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QFont
 
 from file_operations import FileOperations
 from error_handler import ErrorHandler
 from undo_manager import UndoManager
 
+# NumPy 为可选依赖：安装后按列向量化筛选，未安装时逐个文件筛选
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class FileInfo(NamedTuple):
+    """文件列表中的一项，加载时一次性拆分好文件名，之后的显示、筛选和预览直接复用"""
+    path: str  # 文件路径
+    size: int  # 文件大小（字节）
+    mtime: float  # 修改时间戳
+    name: str  # 文件名
+    ext_lower: str  # 小写扩展名，用于筛选
+    stem: str  # 主文件名
+    ext: str  # 扩展名
+
+
+# 文件列表的排序键：同一目录下按文件名排序与按完整路径排序的结果相同，但比较的字符串更短
+_file_name_key = operator.attrgetter('name')
+
+
+def _make_file_info(file_path, file_size, mtime):
+    """
+    构建文件列表中的一项
+    
+    Args:
+        file_path: 文件路径
+        file_size: 文件大小（字节）
+        mtime: 修改时间戳
+        
+    Returns:
+        FileInfo: 文件信息
+    """
+    file_name = os.path.basename(file_path)
+    stem, ext = os.path.splitext(file_name)
+    return FileInfo(file_path, file_size, mtime, file_name, ext.lower(), stem, ext)
+
 
 class FileRenameThread(QThread):
     """文件重命名操作线程类"""
@@ -32,29 +74,84 @@ class FileRenameThread(QThread):
     
     def run(self):
         try:
-            results = []
-            errors = []
-            total = len(self.files_to_rename)
+            last_progress = -1
             
-            for i, (file_path, new_name) in enumerate(self.files_to_rename):
-                try:
-                    success = self.file_ops.rename_file(file_path, new_name, self.target_dir)
-                    if success:
-                        results.append((file_path, new_name))
-                    else:
-                        errors.append((file_path, "重命名失败"))
-                except Exception as e:
-                    errors.append((file_path, str(e)))
-                
-                # 发送进度信号
-                progress_value = int((i + 1) / total * 100)
-                self.progress.emit(progress_value)
+            def report_progress(done, total):
+                # 只在整数百分比变化时发送进度信号，整个过程最多发送100次
+                nonlocal last_progress
+                progress_value = done * 100 // total
+                if progress_value != last_progress:
+                    self.progress.emit(progress_value)
+                    last_progress = progress_value
             
+            # 全部文件一次交给 batch_rename：互相依赖的重命名（如 002→001、003→002）按依赖顺序串行执行，
+            # 其余的在同一个线程池中并发执行
+            results, errors = self.file_ops.batch_rename(self.files_to_rename, self.target_dir, report_progress)
+            
+            if last_progress != 100:
+                self.progress.emit(100)
             self.finished.emit(results, errors)
         except Exception as e:
             self.error.emit(str(e))
 
 
+class FileTableModel(QAbstractTableModel):
+    """文件列表数据模型类，直接引用行数据列表，只在视图绘制可见行时才格式化单元格文本"""
+    
+    def __init__(self, headers, column_formatters, parent=None):
+        """
+        初始化数据模型
+        
+        Args:
+            headers: 列标题列表
+            column_formatters: 与列一一对应的函数列表，接收一行数据并返回该列显示的文本
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._headers = headers
+        self._column_formatters = column_formatters
+        self._rows = []
+    
+    def set_rows(self, rows):
+        """
+        替换模型中的全部行数据
+        
+        Args:
+            rows: 行数据列表，模型只保存引用，不复制
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """返回行数"""
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """返回列数"""
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """返回单元格显示的文本"""
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        try:
+            return self._column_formatters[index.column()](self._rows[index.row()])
+        except Exception:
+            # data 由 Qt 在绘制时回调，异常若传回 C++ 会导致 PyQt5 直接终止程序，因此显示为空
+            return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """返回列标题"""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+
 class MainWindow(QMainWindow):
     """主窗口类"""
     
@@ -62,13 +159,14 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.file_ops = FileOperations()
         self.error_handler = ErrorHandler()
+        self.error_handler.set_parent(self)
         self.undo_manager = UndoManager()
         self.selected_folder = ""
         self.target_folder = ""  # 目标文件夹路径
         self.file_list = []
         self.filtered_files = []
         self.preview_list = []  # 存储预览的文件名映射
-        self.history = []  # 存储操作历史，用于撤销功能
+        self._filter_columns = None  # 文件列表的列式数据（大小、修改时间、扩展名编号），用于向量化筛选
         
         self.init_ui()
     
@@ -164,7 +262,7 @@ class MainWindow(QMainWindow):
         filter_group.setLayout(filter_layout)
         
         # 3. 重命名设置区域 - 使用选项卡
-        rename_tab_widget = QTabWidget()
+        self.rename_tab_widget = QTabWidget()
         
         # 3.1 添加前缀/后缀选项卡
         prefix_suffix_widget = QWidget()
@@ -177,7 +275,7 @@ class MainWindow(QMainWindow):
         prefix_suffix_layout.addRow("后缀:", self.suffix_edit)
         
         prefix_suffix_widget.setLayout(prefix_suffix_layout)
-        rename_tab_widget.addTab(prefix_suffix_widget, "添加前缀/后缀")
+        self.rename_tab_widget.addTab(prefix_suffix_widget, "添加前缀/后缀")
         
         # 3.2 替换字符串选项卡
         replace_widget = QWidget()
@@ -192,7 +290,7 @@ class MainWindow(QMainWindow):
         replace_layout.addRow(self.case_sensitive_check)
         
         replace_widget.setLayout(replace_layout)
-        rename_tab_widget.addTab(replace_widget, "替换字符串")
+        self.rename_tab_widget.addTab(replace_widget, "替换字符串")
         
         # 3.3 正则表达式选项卡
         regex_widget = QWidget()
@@ -206,7 +304,7 @@ class MainWindow(QMainWindow):
         regex_layout.addRow("替换为:", self.regex_replace_edit)
         
         regex_widget.setLayout(regex_layout)
-        rename_tab_widget.addTab(regex_widget, "正则表达式")
+        self.rename_tab_widget.addTab(regex_widget, "正则表达式")
         
         # 3.4 序号重命名选项卡
         numbering_widget = QWidget()
@@ -226,12 +324,12 @@ class MainWindow(QMainWindow):
         numbering_layout.addRow("后缀:", self.numbering_suffix_edit)
         
         numbering_widget.setLayout(numbering_layout)
-        rename_tab_widget.addTab(numbering_widget, "序号重命名")
+        self.rename_tab_widget.addTab(numbering_widget, "序号重命名")
         
         # 重命名设置组
         rename_group = QGroupBox("重命名设置")
         rename_group_layout = QVBoxLayout()
-        rename_group_layout.addWidget(rename_tab_widget)
+        rename_group_layout.addWidget(self.rename_tab_widget)
         rename_group.setLayout(rename_group_layout)
         
         # 4. 文件列表和预览区域
@@ -241,8 +339,15 @@ class MainWindow(QMainWindow):
         original_files_group = QGroupBox("原始文件列表")
         original_files_layout = QVBoxLayout()
         
-        self.original_files_tree = QTreeWidget()
-        self.original_files_tree.setHeaderLabels(["文件名", "大小", "修改日期"])
+        # 使用模型/视图结构，行数据直接引用 filtered_files，大小和日期只在显示时格式化
+        self.original_files_model = FileTableModel(
+            ["文件名", "大小", "修改日期"],
+            [lambda file_info: file_info.name,
+             lambda file_info: self.format_size(file_info.size),
+             lambda file_info: self.format_time(file_info.mtime)],
+            self
+        )
+        self.original_files_tree = self._create_file_view(self.original_files_model)
         self.original_files_tree.setColumnWidth(0, 300)
         original_files_layout.addWidget(self.original_files_tree)
         
@@ -252,8 +357,14 @@ class MainWindow(QMainWindow):
         preview_files_group = QGroupBox("预览修改结果")
         preview_files_layout = QVBoxLayout()
         
-        self.preview_files_tree = QTreeWidget()
-        self.preview_files_tree.setHeaderLabels(["原始文件名", "新文件名"])
+        # 每行为 (原始文件名, 新文件名)
+        self.preview_files_model = FileTableModel(
+            ["原始文件名", "新文件名"],
+            [lambda preview: preview[0],
+             lambda preview: preview[1]],
+            self
+        )
+        self.preview_files_tree = self._create_file_view(self.preview_files_model)
         self.preview_files_tree.setColumnWidth(0, 300)
         self.preview_files_tree.setColumnWidth(1, 300)
         preview_files_layout.addWidget(self.preview_files_tree)
@@ -310,22 +421,78 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            self.file_list = self.file_ops.get_files_in_directory(self.selected_folder)
+            # 修改时间保留为时间戳，仅在显示时格式化；按文件名排序
+            self.file_list = sorted(
+                (_make_file_info(file_path, file_size, mtime)
+                 for file_path, file_size, mtime in self.file_ops.iter_file_stats(self.selected_folder)),
+                key=_file_name_key
+            )
             self.filtered_files = self.file_list.copy()
+            self._filter_columns = self._build_filter_columns(self.file_list)
             self.update_original_files_tree()
         except Exception as e:
             self.error_handler.show_error("错误", f"无法读取文件夹内容: {str(e)}")
     
-    def update_original_files_tree(self):
-        """更新原始文件列表树"""
-        self.original_files_tree.clear()
+    def apply_rename_results(self, results, errors):
+        """
+        根据重命名结果更新文件列表
+        
+        仅在内存中修改被重命名的条目，避免重新扫描整个文件夹；
+        出现错误或有文件被移出当前文件夹时回退为完整刷新
+        
+        Args:
+            results: 成功的操作列表 [(原路径, 新路径), ...]
+            errors: 失败的操作列表
+        """
+        if errors or not results or not self.selected_folder:
+            self.refresh_file_list()
+            return
         
-        for file_info in self.filtered_files:
-            file_path, file_size, modified_time = file_info
-            file_name = os.path.basename(file_path)
+        rename_map = dict(results)
+        known_paths = {file_info.path for file_info in self.file_list}
+        folder = os.path.normcase(os.path.abspath(self.selected_folder))
+        for old_path, new_path in rename_map.items():
+            # 原文件不在当前列表中，或新文件不在当前文件夹（如复制到目标文件夹）
+            if (old_path not in known_paths or
+                    os.path.normcase(os.path.abspath(os.path.dirname(new_path))) != folder):
+                self.refresh_file_list()
+                return
+        
+        # 重命名不改变文件大小和修改时间，只需更新路径、文件名和扩展名
+        file_list = []
+        for file_info in self.file_list:
+            new_path = rename_map.get(file_info.path)
+            if new_path is None:
+                file_list.append(file_info)
+            else:
+                file_list.append(_make_file_info(new_path, file_info.size, file_info.mtime))
+        file_list.sort(key=_file_name_key)
+        
+        self.file_list = file_list
+        self.filtered_files = file_list.copy()
+        self._filter_columns = self._build_filter_columns(file_list)
+        self.update_original_files_tree()
+    
+    def _create_file_view(self, model):
+        """
+        创建显示文件列表的视图
+        
+        Args:
+            model: 视图使用的 FileTableModel
             
-            item = QTreeWidgetItem([file_name, self.format_size(file_size), modified_time.strftime("%Y-%m-%d %H:%M:%S")])
-            self.original_files_tree.addTopLevelItem(item)
+        Returns:
+            QTreeView: 配置好的视图
+        """
+        view = QTreeView()
+        view.setRootIsDecorated(False)
+        # 所有行高度相同，视图无需逐行计算高度，滚动时只处理可见行
+        view.setUniformRowHeights(True)
+        view.setModel(model)
+        return view
+    
+    def update_original_files_tree(self):
+        """更新原始文件列表树"""
+        self.original_files_model.set_rows(self.filtered_files)
     
     def format_size(self, size_bytes):
         """格式化文件大小"""
@@ -336,6 +503,13 @@ class MainWindow(QMainWindow):
         else:
             return f"{size_bytes / (1024 * 1024):.2f} MB"
     
+    def format_time(self, timestamp):
+        """格式化文件修改时间戳，超出平台可表示范围时（如 Windows 上 1970 年以前）返回空字符串"""
+        try:
+            return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        except (OverflowError, OSError, ValueError):
+            return ""
+    
     def apply_filters(self):
         """应用文件筛选条件"""
         if not self.file_list:
@@ -346,37 +520,70 @@ class MainWindow(QMainWindow):
             file_types = [ft.strip().lower() for ft in self.file_type_edit.text().split(',') if ft.strip()]
             min_size_kb = self.min_size_spin.value()
             max_size_kb = self.max_size_spin.value()
-            date_from = self.date_from_edit.dateTime().toPyDateTime()
-            date_to = self.date_to_edit.dateTime().toPyDateTime()
+            # 修改时间以时间戳形式比较
+            date_from = self.date_from_edit.dateTime().toPyDateTime().timestamp()
+            date_to = self.date_to_edit.dateTime().toPyDateTime().timestamp()
+            
+            # 转换为与文件大小相同的单位（字节）
+            min_size = min_size_kb * 1024
+            max_size = max_size_kb * 1024
             
             # 应用筛选
-            self.filtered_files = []
-            for file_info in self.file_list:
-                file_path, file_size, modified_time = file_info
-                
-                # 转换为与筛选条件相同的单位
-                file_size_kb = file_size / 1024
-                
-                # 文件类型筛选
+            if self._filter_columns is not None:
+                sizes, mtimes, ext_values, ext_codes = self._filter_columns
+                mask = (sizes >= min_size) & (sizes <= max_size)
+                mask &= (mtimes >= date_from) & (mtimes <= date_to)
                 if file_types:
-                    file_ext = os.path.splitext(file_path)[1].lower()
-                    if file_ext not in file_types:
+                    # 先在去重后的少量扩展名中匹配，再按整数编号筛选所有文件
+                    allowed_codes = np.flatnonzero(np.isin(ext_values, file_types))
+                    mask &= np.isin(ext_codes, allowed_codes)
+                file_list = self.file_list
+                self.filtered_files = [file_list[i] for i in np.flatnonzero(mask)]
+            else:
+                file_types = set(file_types)
+                self.filtered_files = []
+                for file_info in self.file_list:
+                    # 文件类型筛选
+                    if file_types and file_info.ext_lower not in file_types:
                         continue
-                
-                # 文件大小筛选
-                if not (min_size_kb <= file_size_kb <= max_size_kb):
-                    continue
-                
-                # 修改日期筛选
-                if not (date_from <= modified_time <= date_to):
-                    continue
-                
-                self.filtered_files.append(file_info)
+                    
+                    # 文件大小筛选
+                    if not (min_size <= file_info.size <= max_size):
+                        continue
+                    
+                    # 修改日期筛选
+                    if not (date_from <= file_info.mtime <= date_to):
+                        continue
+                    
+                    self.filtered_files.append(file_info)
             
             self.update_original_files_tree()
         except Exception as e:
             self.error_handler.show_error("筛选错误", f"应用筛选条件时出错: {str(e)}")
     
+    def _build_filter_columns(self, file_list):
+        """
+        将文件列表转换为列式数组，供 apply_filters 向量化筛选
+        
+        Args:
+            file_list: FileInfo 列表
+            
+        Returns:
+            (大小数组, 修改时间戳数组, 去重后的小写扩展名数组, 每个文件的扩展名编号数组)，
+            未安装 NumPy 时返回 None
+        """
+        if np is None:
+            return None
+        
+        sizes = np.fromiter((file_info.size for file_info in file_list), dtype=np.int64, count=len(file_list))
+        mtimes = np.fromiter((file_info.mtime for file_info in file_list),
+                             dtype=np.float64, count=len(file_list))
+        exts = np.array([file_info.ext_lower for file_info in file_list], dtype=object)
+        
+        # 扩展名编码为整数编号，筛选时比较整数而非逐个比较字符串
+        ext_values, ext_codes = np.unique(exts, return_inverse=True)
+        return sizes, mtimes, ext_values, ext_codes.astype(np.intp)
+    
     def preview_rename(self):
         """预览重命名结果"""
         if not self.filtered_files:
@@ -385,16 +592,18 @@ class MainWindow(QMainWindow):
         
         try:
             self.preview_list = []
-            current_tab = self.findChild(QTabWidget).currentIndex()
+            current_tab = self.rename_tab_widget.currentIndex()
             
             # 根据当前选项卡获取重命名参数
             if current_tab == 0:  # 添加前缀/后缀
                 prefix = self.prefix_edit.text()
                 suffix = self.suffix_edit.text()
                 
+                # 主文件名和扩展名直接使用加载时拆分好的结果
+                add_prefix_suffix = self.file_ops.add_prefix_suffix
                 for file_info in self.filtered_files:
-                    file_path, _, _ = file_info
-                    new_name = self.file_ops.add_prefix_suffix(file_path, prefix, suffix)
+                    file_path = file_info.path
+                    new_name = add_prefix_suffix(file_path, prefix, suffix, (file_info.stem, file_info.ext))
                     self.preview_list.append((file_path, new_name))
             
             elif current_tab == 1:  # 替换字符串
@@ -402,19 +611,23 @@ class MainWindow(QMainWindow):
                 replace_str = self.replace_edit.text()
                 case_sensitive = self.case_sensitive_check.isChecked()
                 
+                # 不区分大小写时，查找内容的大小写折叠结果只计算一次
+                folded_find_str = None if case_sensitive else find_str.casefold()
+                
+                replace_string = self.file_ops.replace_string
                 for file_info in self.filtered_files:
-                    file_path, _, _ = file_info
-                    new_name = self.file_ops.replace_string(file_path, find_str, replace_str, case_sensitive)
+                    file_path = file_info.path
+                    new_name = replace_string(file_path, find_str, replace_str, case_sensitive, folded_find_str)
                     self.preview_list.append((file_path, new_name))
             
             elif current_tab == 2:  # 正则表达式
-                pattern = self.regex_pattern_edit.text()
+                pattern_str = self.regex_pattern_edit.text()
                 replace_str = self.regex_replace_edit.text()
                 
-                for file_info in self.filtered_files:
-                    file_path, _, _ = file_info
-                    new_name = self.file_ops.regex_replace(file_path, pattern, replace_str)
-                    self.preview_list.append((file_path, new_name))
+                # 整批一次替换，正则表达式只编译一次
+                file_paths = [file_info.path for file_info in self.filtered_files]
+                new_names = self.file_ops.batch_regex_replace(file_paths, pattern_str, replace_str)
+                self.preview_list = list(zip(file_paths, new_names))
             
             elif current_tab == 3:  # 序号重命名
                 prefix = self.numbering_prefix_edit.text()
@@ -422,24 +635,33 @@ class MainWindow(QMainWindow):
                 start_num = self.start_number_spin.value()
                 digits = self.digits_spin.value()
                 
-                for i, file_info in enumerate(self.filtered_files):
-                    file_path, _, _ = file_info
-                    new_name = self.file_ops.numbering_rename(file_path, prefix, suffix, start_num + i, digits)
-                    self.preview_list.append((file_path, new_name))
+                # 整批一次生成新文件名，避免逐个文件调用
+                file_paths = [file_info.path for file_info in self.filtered_files]
+                extensions = [file_info.ext for file_info in self.filtered_files]
+                new_names = self.file_ops.batch_numbering_rename(file_paths, prefix, suffix, start_num, digits,
+                                                                 extensions)
+                self.preview_list = list(zip(file_paths, new_names))
             
-            # 更新预览列表
-            self.update_preview_tree()
+            # 更新预览列表，原始文件名直接使用加载时缓存的结果
+            self.update_preview_tree([file_info.name for file_info in self.filtered_files])
         except Exception as e:
             self.error_handler.show_error("预览错误", f"生成预览时出错: {str(e)}")
     
-    def update_preview_tree(self):
-        """更新预览文件列表树"""
-        self.preview_files_tree.clear()
-        
-        for file_path, new_name in self.preview_list:
-            original_name = os.path.basename(file_path)
-            item = QTreeWidgetItem([original_name, new_name])
-            self.preview_files_tree.addTopLevelItem(item)
+    def update_preview_tree(self, original_names=None):
+        """
+        更新预览文件列表树
+        
+        Args:
+            original_names: 与 preview_list 一一对应的原始文件名列表，为None时从路径中提取
+        """
+        if original_names is None:
+            basename = os.path.basename
+            original_names = [basename(file_path) for file_path, _ in self.preview_list]
+        
+        self.preview_files_model.set_rows([
+            (original_name, new_name)
+            for original_name, (_, new_name) in zip(original_names, self.preview_list)
+        ])
     
     def apply_rename(self):
         """应用重命名操作"""
@@ -456,13 +678,7 @@ class MainWindow(QMainWindow):
         else:
             message = f"确定要重命名 {len(self.preview_list)} 个文件吗？"
             
-        reply = QMessageBox.question(
-            self, "确认重命名", 
-            message,
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        
-        if reply != QMessageBox.Yes:
+        if not self.error_handler.ask_question("确认重命名", message, default=True):
             return
         
         # 显示进度条
@@ -472,9 +688,7 @@ class MainWindow(QMainWindow):
         # 检查文件名冲突
         conflicts = self.check_name_conflicts()
         if conflicts:
-            conflict_msg = "发现文件名冲突:\n"
-            for conflict in conflicts:
-                conflict_msg += f"- {conflict}\n"
+            conflict_msg = "发现文件名冲突:\n" + "\n".join(f"- {conflict}" for conflict in conflicts)
             self.error_handler.show_error("文件名冲突", conflict_msg)
             self.progress_bar.setVisible(False)
             return
@@ -490,15 +704,13 @@ class MainWindow(QMainWindow):
     
     def check_name_conflicts(self):
         """检查重命名后是否有文件名冲突"""
-        conflicts = []
-        new_names = set()
+        new_names = [new_name for _, new_name in self.preview_list]
         
-        for _, new_name in self.preview_list:
-            if new_name in new_names:
-                conflicts.append(new_name)
-            new_names.add(new_name)
+        # 常见的无冲突情况只需比较去重前后的数量
+        if len(set(new_names)) == len(new_names):
+            return []
         
-        return conflicts
+        return [new_name for new_name, count in Counter(new_names).items() if count > 1]
     
     def update_progress(self, value):
         """更新进度条"""
@@ -508,30 +720,39 @@ class MainWindow(QMainWindow):
         """重命名完成后的处理"""
         self.progress_bar.setVisible(False)
         
-        # 保存操作历史
+        # 保存操作历史到撤销管理器
         if results:
-            self.history.append(results)
-            # 记录到撤销管理器
             self.undo_manager.record_operation(results)
             self.update_undo_redo_buttons()
         
         # 显示结果
         if errors:
-            error_msg = "部分文件重命名失败:\n"
-            for file_path, error in errors[:5]:  # 只显示前5个错误
-                error_msg += f"- {os.path.basename(file_path)}: {error}\n"
-            if len(errors) > 5:
-                error_msg += f"... 还有 {len(errors) - 5} 个错误\n"
-            QMessageBox.warning(self, "重命名结果", 
-                              f"成功重命名 {len(results)} 个文件\n{error_msg}")
+            error_msg = self._format_errors("部分文件重命名失败", errors)
+            self.error_handler.show_warning("重命名结果", f"成功重命名 {len(results)} 个文件\n{error_msg}")
         else:
-            QMessageBox.information(self, "重命名结果", 
-                                  f"成功重命名 {len(results)} 个文件")
+            self.error_handler.show_info("重命名结果", f"成功重命名 {len(results)} 个文件")
         
         # 刷新文件列表
-        self.refresh_file_list()
+        self.apply_rename_results(results, errors)
         self.preview_list = []
-        self.preview_files_tree.clear()
+        self.update_preview_tree()
+    
+    def _format_errors(self, header, errors, limit=5):
+        """
+        生成错误汇总文本，只列出前几个错误
+        
+        Args:
+            header: 汇总标题
+            errors: (文件路径, 错误信息) 元组列表
+            limit: 最多列出的错误数量
+            
+        Returns:
+            错误汇总文本
+        """
+        lines = [f"- {os.path.basename(file_path)}: {error}" for file_path, error in errors[:limit]]
+        if len(errors) > limit:
+            lines.append(f"... 还有 {len(errors) - limit} 个错误")
+        return f"{header}:\n" + "\n".join(lines)
     
     def rename_error(self, error_msg):
         """重命名出错处理"""
@@ -564,13 +785,7 @@ class MainWindow(QMainWindow):
             return
         
         # 确认撤销
-        reply = QMessageBox.question(
-            self, "确认撤销", 
-            "确定要撤销上一次重命名操作吗？",
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        
-        if reply != QMessageBox.Yes:
+        if not self.error_handler.ask_question("确认撤销", "确定要撤销上一次重命名操作吗？", default=True):
             return
         
         # 从撤销管理器获取撤销操作
@@ -597,19 +812,13 @@ class MainWindow(QMainWindow):
         
         # 显示结果
         if errors:
-            error_msg = "部分文件撤销失败:\n"
-            for file_path, error in errors[:5]:
-                error_msg += f"- {os.path.basename(file_path)}: {error}\n"
-            if len(errors) > 5:
-                error_msg += f"... 还有 {len(errors) - 5} 个错误\n"
-            QMessageBox.warning(self, "撤销结果", 
-                              f"成功撤销 {len(results)} 个文件\n{error_msg}")
+            error_msg = self._format_errors("部分文件撤销失败", errors)
+            self.error_handler.show_warning("撤销结果", f"成功撤销 {len(results)} 个文件\n{error_msg}")
         else:
-            QMessageBox.information(self, "撤销结果", 
-                                  f"成功撤销 {len(results)} 个文件")
+            self.error_handler.show_info("撤销结果", f"成功撤销 {len(results)} 个文件")
         
         # 刷新文件列表
-        self.refresh_file_list()
+        self.apply_rename_results(results, errors)
     
     def undo_error(self, error_msg):
         """撤销出错处理"""
@@ -633,13 +842,7 @@ class MainWindow(QMainWindow):
             return
         
         # 确认重做
-        reply = QMessageBox.question(
-            self, "确认重做", 
-            "确定要重做上一次操作吗？",
-            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-        )
-        
-        if reply != QMessageBox.Yes:
+        if not self.error_handler.ask_question("确认重做", "确定要重做上一次操作吗？", default=True):
             return
         
         # 获取重做操作
@@ -672,19 +875,13 @@ class MainWindow(QMainWindow):
         
         # 显示结果
         if errors:
-            error_msg = "部分文件重做失败:\n"
-            for file_path, error in errors[:5]:
-                error_msg += f"- {os.path.basename(file_path)}: {error}\n"
-            if len(errors) > 5:
-                error_msg += f"... 还有 {len(errors) - 5} 个错误\n"
-            QMessageBox.warning(self, "重做结果", 
-                              f"成功重做 {len(results)} 个文件\n{error_msg}")
+            error_msg = self._format_errors("部分文件重做失败", errors)
+            self.error_handler.show_warning("重做结果", f"成功重做 {len(results)} 个文件\n{error_msg}")
         else:
-            QMessageBox.information(self, "重做结果", 
-                                  f"成功重做 {len(results)} 个文件")
+            self.error_handler.show_info("重做结果", f"成功重做 {len(results)} 个文件")
         
         # 刷新文件列表
-        self.refresh_file_list()
+        self.apply_rename_results(results, errors)
     
     def redo_error(self, error_msg):
         """重做出错处理"""
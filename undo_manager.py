@@ -5,6 +5,14 @@
 import os
 import time
 from collections import deque
+from typing import NamedTuple
+
+
+class RenameRecord(NamedTuple):
+    """一次批量重命名的历史记录"""
+    ts: float  # 记录时间戳
+    ops: tuple  # 重命名操作，每个元素为 (old_path, new_path)
+    count: int  # 操作涉及的文件数量
 
 
 class UndoManager:
@@ -18,7 +26,6 @@ class UndoManager:
         """
         self.undo_stack = deque(maxlen=max_history)
         self.redo_stack = deque(maxlen=max_history)
-        self.current_operation_id = 0
     
     def record_operation(self, rename_operations):
         """记录重命名操作
@@ -29,20 +36,8 @@ class UndoManager:
         if not rename_operations:
             return
         
-        # 生成操作ID
-        operation_id = f"{time.time():.6f}_{self.current_operation_id}"
-        self.current_operation_id += 1
-        
-        # 记录操作信息
-        operation_info = {
-            'id': operation_id,
-            'timestamp': time.time(),
-            'operations': rename_operations,
-            'description': f"批量重命名 {len(rename_operations)} 个文件"
-        }
-        
-        # 添加到撤销栈
-        self.undo_stack.append(operation_info)
+        # 添加到撤销栈，描述在需要时再生成
+        self.undo_stack.append(RenameRecord(time.time(), tuple(rename_operations), len(rename_operations)))
         
         # 清空重做栈
         self.redo_stack.clear()
@@ -75,18 +70,12 @@ class UndoManager:
         # 获取上一个操作
         operation = self.undo_stack.pop()
         
+        # 对于撤销操作，我们要恢复到原始状态，所以old_path现在是目标路径
+        # 对于跨文件夹操作，确保目标目录存在（每个目录只创建一次）
+        self._ensure_dirs(old_path for old_path, _ in operation.ops)
+        
         # 准备撤销操作（交换old_path和new_path）
-        # 对于跨文件夹操作，确保目标目录存在
-        undo_operations = []
-        for old_path, new_path in operation['operations']:
-            # 对于撤销操作，我们要恢复到原始状态，所以old_path现在是目标路径
-            # 确保目标目录存在
-            target_dir = os.path.dirname(new_path)
-            if target_dir and not os.path.exists(target_dir):
-                os.makedirs(target_dir)
-            
-            # 添加到撤销操作列表（注意交换顺序）
-            undo_operations.append((new_path, old_path))
+        undo_operations = [(new_path, old_path) for old_path, new_path in operation.ops]
         
         # 保存到重做栈
         self.redo_stack.append(operation)
@@ -105,21 +94,27 @@ class UndoManager:
         # 获取重做操作
         operation = self.redo_stack.pop()
         
-        # 确保目标目录存在
-        redo_operations = []
-        for old_path, new_path in operation['operations']:
-            # 对于重做操作，new_path是目标路径
-            target_dir = os.path.dirname(new_path)
-            if target_dir and not os.path.exists(target_dir):
-                os.makedirs(target_dir)
-            
-            redo_operations.append((old_path, new_path))
+        # 对于重做操作，new_path是目标路径，确保目标目录存在（每个目录只创建一次）
+        self._ensure_dirs(new_path for _, new_path in operation.ops)
+        
+        redo_operations = list(operation.ops)
         
         # 保存到撤销栈
         self.undo_stack.append(operation)
         
         return redo_operations
     
+    def _ensure_dirs(self, target_paths):
+        """确保目标路径所在的目录存在，相同目录只处理一次
+        
+        Args:
+            target_paths: 目标文件路径的可迭代对象
+        """
+        target_dirs = {os.path.dirname(path) for path in target_paths}
+        for target_dir in target_dirs:
+            if target_dir:
+                os.makedirs(target_dir, exist_ok=True)
+    
     def get_undo_description(self):
         """获取下一个撤销操作的描述
         
@@ -127,7 +122,7 @@ class UndoManager:
             str: 撤销操作描述
         """
         if self.can_undo():
-            return self.undo_stack[-1]['description']
+            return self._describe(self.undo_stack[-1])
         return ""
     
     def get_redo_description(self):
@@ -137,11 +132,21 @@ class UndoManager:
             str: 重做操作描述
         """
         if self.can_redo():
-            return self.redo_stack[-1]['description']
+            return self._describe(self.redo_stack[-1])
         return ""
     
+    def _describe(self, record):
+        """生成历史记录的描述文字
+        
+        Args:
+            record: RenameRecord 历史记录
+            
+        Returns:
+            str: 操作描述
+        """
+        return f"批量重命名 {record.count} 个文件"
+    
     def clear_history(self):
         """清除所有历史记录"""
         self.undo_stack.clear()
-        self.redo_stack.clear()
-        self.current_operation_id = 0
\ No newline at end of file
+        self.redo_stack.clear()
\ No newline at end of file